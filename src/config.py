@@ -36,6 +36,11 @@ class DatabaseConfig(BaseSettings):
         description='Use JSONB fo the metadata'
     )
 
+    parent_table_name: str = Field(
+        default='langchain_pg_parent_document',
+        description='Name of the table with the parent windows of the chunks'
+    )
+
     model_config = SettingsConfigDict(
         env_file=ENV_FILE,
         env_prefix='DATABASE_',
@@ -60,6 +65,18 @@ class PDFConfig(BaseSettings):
         le=200,
         description='Chunk overlap for the PDF'
     )
+    child_chunk_size: int = Field(
+        default=300,
+        ge=50,
+        le=1000,
+        description='Size of the child chunks embedded inside each parent window'
+    )
+    child_chunk_overlap: int = Field(
+        default=50,
+        ge=0,
+        le=200,
+        description='Overlap of the child chunks inside each parent window'
+    )
 
     @field_validator('chunk_overlap')
     @classmethod
@@ -69,9 +86,28 @@ class PDFConfig(BaseSettings):
         if hasattr(info.data, 'chunk_size') and v >=info.data.get('chunk_size', 0):
             raise ValueError('chunk_overlap must be less than chunk_size')
         return v
+
+    @field_validator('child_chunk_size')
+    @classmethod
+    def validate_child_size(cls, v: int, info) -> int:
+        """Validate the child chunk size is less than the chunk_size"""
+        chunk_size = info.data.get('chunk_size')
+        if chunk_size is not None and v >= chunk_size:
+            raise ValueError('child_chunk_size must be less than chunk_size')
+        return v
+
+    @field_validator('child_chunk_overlap')
+    @classmethod
+    def validate_child_overlap(cls, v: int, info) -> int:
+        """Validate the child chunk overlap is less than the child_chunk_size"""
+        child_chunk_size = info.data.get('child_chunk_size')
+        if child_chunk_size is not None and v >= child_chunk_size:
+            raise ValueError('child_chunk_overlap must be less than child_chunk_size')
+        return v
     
     model_config = SettingsConfigDict(
         env_file=ENV_FILE,
+        env_prefix='PDF_',
         case_sensitive=False,
         extra="ignore",
     )
@@ -154,6 +190,21 @@ class SearchConfig(BaseSettings):
         le=1.0,
         description="Threshold mínimo de similaridade (0-1)"
     )
+    adaptive_k: bool = Field(
+        default=False,
+        description="Corta os resultados no primeiro salto grande de score ou ao atingir a relevância acumulada"
+    )
+    max_score_gap: float = Field(
+        default=0.15,
+        gt=0.0,
+        le=1.0,
+        description="Salto máximo de similaridade entre resultados consecutivos (adaptive_k)"
+    )
+    cumulative_score_target: float = Field(
+        default=2.0,
+        gt=0.0,
+        description="Soma de similaridade a partir da qual a busca para (adaptive_k)"
+    )
     
     model_config = SettingsConfigDict(
         env_file=ENV_FILE,
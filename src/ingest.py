@@ -1,7 +1,10 @@
 """Script de ingestão de PDF no banco vetorial."""
 
+import hashlib
+import json
 import sys
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 # Adicionar diretório raiz ao path para imports
 root_dir = Path(__file__).parent.parent
@@ -11,15 +14,129 @@ from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from src.config import get_settings
-from src.services.vector_store import get_vector_store
+from src.config import Settings, get_settings
+from src.services.parent_store import (
+    delete_stale_parent_documents,
+    ensure_parent_table,
+    save_parent_documents,
+)
+from src.services.vector_store import delete_stale_documents, get_vector_store
+
+
+def _parent_id(document: Document) -> str:
+    """Gera ID estável da janela pai a partir do seu conteúdo e metadados."""
+    payload = json.dumps(
+        {'content': document.page_content, 'metadata': document.metadata},
+        sort_keys=True,
+        default=str,
+    )
+    return f"parent-{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def split_documents(
+    docs: List[Document],
+    settings: Settings
+) -> Tuple[List[Document], List[str], List[Document], List[str]]:
+    """
+    Divide as páginas em janelas pai e cada janela em chunks filhos menores.
+    
+    Args:
+        docs: Páginas carregadas do PDF
+        settings: Configurações da aplicação
+        
+    Returns:
+        Tupla (janelas pai, IDs das janelas, chunks filhos, IDs dos filhos).
+        Cada filho guarda o ID da sua janela em `metadata['parent_id']`.
+    """
+    # Dividir em janelas pai (contexto entregue ao LLM)
+    parent_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=settings.pdf.chunk_size,
+        chunk_overlap=settings.pdf.chunk_overlap
+    )
+    splits = parent_splitter.split_documents(docs)
+    
+    # Enriquecer documentos (remover metadados vazios) e descartar janelas
+    # idênticas; IDs derivados do conteúdo: um filho nunca aponta para outra janela
+    parents_by_id: Dict[str, Document] = {}
+    for document in splits:
+        parent = Document(
+            page_content=document.page_content,
+            metadata={
+                key: value 
+                for key, value in document.metadata.items() 
+                if value not in ('', None)
+            }
+        )
+        parents_by_id.setdefault(_parent_id(parent), parent)
+    
+    # Dividir cada janela pai em chunks filhos menores (usados nos embeddings)
+    child_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=settings.pdf.child_chunk_size,
+        chunk_overlap=settings.pdf.child_chunk_overlap
+    )
+    children = []
+    ids = []
+    for parent_id, parent in parents_by_id.items():
+        for index, child in enumerate(child_splitter.split_documents([parent])):
+            children.append(Document(
+                page_content=child.page_content,
+                metadata={**child.metadata, 'parent_id': parent_id}
+            ))
+            ids.append(f'{parent_id}-{index}')
+    
+    return list(parents_by_id.values()), list(parents_by_id), children, ids
+
+
+def ingest_documents(docs: List[Document], settings: Settings) -> None:
+    """
+    Salva as janelas pai e os embeddings dos chunks filhos das páginas.
+    
+    A ordem mantém a busca consistente se algo falhar no meio: a tabela de
+    janelas pai é criada e as janelas gravadas antes dos filhos que apontam
+    para elas, e só depois de todos os filhos salvos os registros de
+    ingestões anteriores são removidos.
+    
+    Args:
+        docs: Páginas carregadas do PDF
+        settings: Configurações da aplicação
+    """
+    parents, parent_ids, children, ids = split_documents(docs, settings)
+    
+    if not children:
+        raise ValueError("Nenhum chunk foi criado do PDF.")
+    
+    print(f'Total de janelas pai criadas: {len(parents)}')
+    print(f'Total de chunks criados: {len(children)}')
+    
+    # Obter instância do vector store
+    store = get_vector_store(settings)
+    
+    # Salvar janelas pai na tabela auxiliar
+    print("Salvando janelas pai no banco...")
+    ensure_parent_table(settings, store.session_maker)
+    save_parent_documents(
+        documents=parents,
+        ids=parent_ids,
+        settings=settings,
+        session_maker=store.session_maker,
+    )
+    
+    # Adicionar documentos ao banco
+    print("Salvando documentos no banco vetorial...")
+    store.add_documents(documents=children, ids=ids)
+    
+    # Remover filhos e janelas de ingestões anteriores
+    delete_stale_documents(ids, settings, store)
+    delete_stale_parent_documents(parent_ids, settings, store.session_maker)
 
 
 def ingest_pdf():
     """
     Ingesta PDF no banco vetorial.
     
-    Carrega o PDF, divide em chunks, cria embeddings e salva no banco.
+    Carrega o PDF, divide em janelas pai e em chunks filhos menores,
+    salva as janelas pai em tabela auxiliar e os embeddings dos filhos
+    no banco vetorial.
     """
     settings = get_settings()
     
@@ -40,40 +157,7 @@ def ingest_pdf():
     if not docs:
         raise ValueError("Nenhum documento foi carregado do PDF.")
     
-    # Dividir em chunks
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=settings.pdf.chunk_size,
-        chunk_overlap=settings.pdf.chunk_overlap
-    )
-    splits = splitter.split_documents(docs)
-    
-    if not splits:
-        raise ValueError("Nenhum chunk foi criado do PDF.")
-    
-    # Enriquecer documentos (remover metadados vazios)
-    enriched = [
-        Document(
-            page_content=document.page_content,
-            metadata={
-                key: value 
-                for key, value in document.metadata.items() 
-                if value not in ('', None)
-            }
-        )
-        for document in splits
-    ]
-    
-    print(f'Total de chunks criados: {len(enriched)}')
-    
-    # Criar IDs para os documentos
-    ids = [f'doc-{index}' for index in range(len(enriched))]
-    
-    # Obter instância do vector store
-    store = get_vector_store(settings)
-    
-    # Adicionar documentos ao banco
-    print("Salvando documentos no banco vetorial...")
-    store.add_documents(documents=enriched, ids=ids)
+    ingest_documents(docs, settings)
     
     print("Ingestão concluída com sucesso!")
 
@@ -8,13 +8,16 @@ root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
 from src.config import get_settings
-from src.services.vector_store import search_documents
+from src.services.vector_store import search_parent_documents
 
 
 def search_documents_for_question(question: str) -> str:
     """
     Busca documentos no banco vetorial e retorna contexto formatado.
     
+    Os chunks filhos encontrados são substituídos pelas suas janelas pai
+    (sem repetições) antes de montar o contexto.
+    
     Args:
         question: Pergunta do usuário
         
@@ -25,7 +28,7 @@ def search_documents_for_question(question: str) -> str:
         return ""
     
     settings = get_settings()
-    results = search_documents(question, settings, k=settings.search.k)
+    results = search_parent_documents(question, settings, k=settings.search.k)
     
     if not results:
         return ""
@@ -2,11 +2,28 @@
 
 from .embeddings import get_embeddings
 from .llm import get_llm
-from .vector_store import get_vector_store, search_documents
+from .parent_store import (
+    delete_stale_parent_documents,
+    ensure_parent_table,
+    get_parent_documents,
+    save_parent_documents,
+)
+from .vector_store import (
+    delete_stale_documents,
+    get_vector_store,
+    search_documents,
+    search_parent_documents,
+)
 
 __all__ = [
+    "delete_stale_documents",
+    "delete_stale_parent_documents",
+    "ensure_parent_table",
     "get_embeddings",
     "get_llm",
+    "get_parent_documents",
     "get_vector_store",
+    "save_parent_documents",
     "search_documents",
+    "search_parent_documents",
 ]
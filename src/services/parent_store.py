@@ -0,0 +1,160 @@
+"""Serviço para gerenciar as janelas pai (parent windows) dos chunks."""
+
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Adicionar diretório raiz ao path para imports
+root_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from langchain_core.documents import Document
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from src.config import Settings
+
+
+def ensure_parent_table(
+    settings: Settings,
+    session_maker: Callable[[], Session]
+) -> None:
+    """
+    Cria a tabela de janelas pai caso ainda não exista.
+
+    Roda em transação própria, para que a tabela exista antes de qualquer
+    chunk filho apontar para ela.
+
+    Args:
+        settings: Configurações da aplicação
+        session_maker: Fábrica de sessões do vector store (ex.: `store.session_maker`)
+    """
+    with session_maker() as session:
+        session.execute(text(
+            f"""
+            CREATE TABLE IF NOT EXISTS {settings.database.parent_table_name} (
+                collection_name VARCHAR NOT NULL,
+                id VARCHAR NOT NULL,
+                content TEXT NOT NULL,
+                metadata JSONB NOT NULL DEFAULT '{{}}'::jsonb,
+                PRIMARY KEY (collection_name, id)
+            )
+            """
+        ))
+        session.commit()
+
+
+def save_parent_documents(
+    documents: List[Document],
+    ids: List[str],
+    settings: Settings,
+    session_maker: Callable[[], Session]
+) -> None:
+    """
+    Salva (ou atualiza) as janelas pai da coleção configurada.
+
+    Args:
+        documents: Janelas pai a serem salvas
+        ids: IDs das janelas pai, na mesma ordem de documents
+        settings: Configurações da aplicação
+        session_maker: Fábrica de sessões do vector store (ex.: `store.session_maker`)
+    """
+    if len(documents) != len(ids):
+        raise ValueError("documents e ids devem ter o mesmo tamanho.")
+
+    if not documents:
+        return
+
+    statement = text(
+        f"""
+        INSERT INTO {settings.database.parent_table_name} (collection_name, id, content, metadata)
+        VALUES (:collection_name, :id, :content, :metadata)
+        ON CONFLICT (collection_name, id)
+        DO UPDATE SET content = EXCLUDED.content, metadata = EXCLUDED.metadata
+        """
+    ).bindparams(bindparam("metadata", type_=JSONB))
+
+    rows = [
+        {
+            "collection_name": settings.database.collection_name,
+            "id": parent_id,
+            "content": document.page_content,
+            "metadata": document.metadata,
+        }
+        for parent_id, document in zip(ids, documents)
+    ]
+
+    with session_maker() as session:
+        session.execute(statement, rows)
+        session.commit()
+
+
+def delete_stale_parent_documents(
+    ids: List[str],
+    settings: Settings,
+    session_maker: Callable[[], Session]
+) -> None:
+    """
+    Remove as janelas pai da coleção que não estão em `ids`.
+
+    Args:
+        ids: IDs das janelas pai que devem ser mantidas
+        settings: Configurações da aplicação
+        session_maker: Fábrica de sessões do vector store (ex.: `store.session_maker`)
+    """
+    statement = text(
+        f"""
+        DELETE FROM {settings.database.parent_table_name}
+        WHERE collection_name = :collection_name AND NOT (id IN :ids)
+        """
+    ).bindparams(bindparam("ids", expanding=True))
+
+    with session_maker() as session:
+        session.execute(
+            statement,
+            {"collection_name": settings.database.collection_name, "ids": list(ids)},
+        )
+        session.commit()
+
+
+def get_parent_documents(
+    ids: List[str],
+    settings: Settings,
+    session_maker: Callable[[], Session]
+) -> Dict[str, Document]:
+    """
+    Busca as janelas pai pelos seus IDs em uma única consulta pela chave primária.
+
+    Args:
+        ids: IDs das janelas pai
+        settings: Configurações da aplicação
+        session_maker: Fábrica de sessões do vector store (ex.: `store.session_maker`)
+
+    Returns:
+        Dicionário {id: Document} com as janelas encontradas
+    """
+    if not ids:
+        return {}
+
+    statement = text(
+        f"""
+        SELECT id, content, metadata
+        FROM {settings.database.parent_table_name}
+        WHERE collection_name = :collection_name AND id IN :ids
+        """
+    ).bindparams(bindparam("ids", expanding=True))
+
+    with session_maker() as session:
+        rows = session.execute(
+            statement,
+            {"collection_name": settings.database.collection_name, "ids": list(ids)},
+        ).all()
+
+    return {
+        row.id: Document(
+            page_content=row.content,
+            metadata=dict(row.metadata or {}),
+        )
+        for row in rows
+    }
@@ -1,8 +1,9 @@
 """Serviço para gerenciar acesso ao banco vetorial (PGVector)."""
 
+import math
 import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 # Adicionar diretório raiz ao path para imports
 root_dir = Path(__file__).parent.parent.parent
@@ -10,9 +11,12 @@ sys.path.insert(0, str(root_dir))
 
 from langchain_core.documents import Document
 from langchain_postgres import PGVector
+from langchain_postgres.vectorstores import DistanceStrategy
+from sqlalchemy import bindparam, text
 
 from src.config import Settings
 from src.services.embeddings import get_embeddings
+from src.services.parent_store import get_parent_documents
 
 
 def get_vector_store(settings: Settings) -> PGVector:
@@ -32,29 +36,248 @@ def get_vector_store(settings: Settings) -> PGVector:
         collection_name=settings.database.collection_name,
         connection=settings.database.url,
         use_jsonb=settings.database.use_jsonb,
+        distance_strategy=DISTANCE_STRATEGY,
     )
 
 
+def delete_stale_documents(
+    ids: List[str],
+    settings: Settings,
+    store: PGVector
+) -> None:
+    """
+    Remove da coleção os embeddings cujos IDs não estão em `ids`.
+    
+    Args:
+        ids: IDs dos documentos que devem ser mantidos
+        settings: Configurações da aplicação
+        store: Vector store da coleção
+    """
+    statement = text(
+        f"""
+        DELETE FROM {store.EmbeddingStore.__tablename__} e
+        USING {store.CollectionStore.__tablename__} c
+        WHERE e.collection_id = c.uuid
+          AND c.name = :collection_name
+          AND NOT (e.id IN :ids)
+        """
+    ).bindparams(bindparam("ids", expanding=True))
+    
+    with store.session_maker() as session:
+        session.execute(
+            statement,
+            {"collection_name": settings.database.collection_name, "ids": list(ids)},
+        )
+        session.commit()
+
+
+class _DistanceSQL(NamedTuple):
+    """Operador pgvector e conversões de score de uma estratégia de distância."""
+    operator: str
+    relevance: Callable[[str], str]
+    max_distance: Callable[[float], float]
+
+
+# Mesmas conversões de relevância usadas pelo LangChain para cada estratégia
+_DISTANCE_SQL = {
+    DistanceStrategy.COSINE: _DistanceSQL(
+        operator='<=>',
+        relevance=lambda distance: f'1 - {distance}',
+        max_distance=lambda similarity: 1 - similarity,
+    ),
+    DistanceStrategy.EUCLIDEAN: _DistanceSQL(
+        operator='<->',
+        relevance=lambda distance: f'1 - {distance} / sqrt(2)',
+        max_distance=lambda similarity: (1 - similarity) * math.sqrt(2),
+    ),
+}
+
+DISTANCE_STRATEGY = DistanceStrategy.COSINE
+
+
+def _get_distance_sql(distance_strategy: DistanceStrategy) -> _DistanceSQL:
+    """Retorna o SQL da estratégia de distância ou falha se não for suportada."""
+    try:
+        return _DISTANCE_SQL[distance_strategy]
+    except KeyError:
+        raise ValueError(
+            f"Estratégia de distância não suportada na busca: {distance_strategy}"
+        ) from None
+
+
+def _build_search_query(
+    embedding_table: str,
+    collection_table: str,
+    distance_strategy: DistanceStrategy,
+    score_threshold: Optional[float],
+    adaptive_k: bool
+) -> str:
+    """
+    Monta a consulta de similaridade da coleção.
+    
+    O threshold e o corte adaptativo são aplicados no próprio banco, de modo
+    que apenas as linhas relevantes são trafegadas e convertidas em Document.
+    As colunas seguem os modelos `EmbeddingStore` e `CollectionStore` do
+    langchain-postgres.
+    """
+    distance_sql = _get_distance_sql(distance_strategy)
+    distance = f"e.embedding {distance_sql.operator} CAST(:embedding AS vector)"
+    threshold_clause = (
+        f"AND {distance} <= :max_distance"
+        if score_threshold is not None
+        else ""
+    )
+    candidates = f"""
+        SELECT
+            e.id,
+            e.document,
+            e.cmetadata,
+            {distance} AS distance
+        FROM {embedding_table} e
+        JOIN {collection_table} c ON e.collection_id = c.uuid
+        WHERE c.name = :collection_name
+        {threshold_clause}
+        ORDER BY distance
+        LIMIT :k
+    """
+    
+    if not adaptive_k:
+        return candidates
+    
+    # Corte adaptativo: para no primeiro salto de similaridade maior que
+    # max_score_gap ou quando a similaridade acumulada atinge o alvo
+    return f"""
+        WITH candidates AS (
+            SELECT *, {distance_sql.relevance('distance')} AS relevance
+            FROM ({candidates}) AS nearest
+        ),
+        ranked AS (
+            SELECT
+                *,
+                LAG(relevance) OVER (ORDER BY distance, id) - relevance AS gap,
+                SUM(relevance) OVER running - relevance AS relevance_before
+            FROM candidates
+            WINDOW running AS (
+                ORDER BY distance, id
+                ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+            )
+        ),
+        cut AS (
+            SELECT
+                *,
+                COUNT(*) FILTER (WHERE gap > :max_score_gap) OVER (
+                    ORDER BY distance, id
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                ) AS gaps_seen
+            FROM ranked
+        )
+        SELECT id, document, cmetadata, distance
+        FROM cut
+        WHERE gaps_seen = 0 AND relevance_before < :cumulative_score_target
+        ORDER BY distance, id
+    """
+
+
 def search_documents(
     question: str, 
     settings: Settings, 
-    k: int = 10
+    k: int = 10,
+    store: Optional[PGVector] = None
 ) -> List[Tuple[Document, float]]:
     """
     Busca documentos similares no banco vetorial.
     
+    Aplica `score_threshold` (similaridade mínima) e, com `adaptive_k`,
+    o corte por salto de score ou relevância acumulada dentro da consulta SQL.
+    
     Args:
         question: Pergunta do usuário para buscar documentos similares
         settings: Configurações da aplicação
-        k: Número de resultados a retornar (padrão: 10)
+        k: Número máximo de resultados a retornar (padrão: 10)
+        store: Vector store já criado, para reaproveitar a conexão (opcional)
         
     Returns:
-        Lista de tuplas (Document, score) com os documentos mais similares
+        Lista de tuplas (Document, score) com os documentos mais similares,
+        onde score é a distância de DISTANCE_STRATEGY (menor é mais similar)
     """
     if not question or not question.strip():
         return []
     
+    search = settings.search
+    store = store or get_vector_store(settings)
+    embedding = store.embeddings.embed_query(question)
+    
+    params = {
+        "embedding": str(embedding),
+        "collection_name": settings.database.collection_name,
+        "k": k,
+    }
+    distance_sql = _get_distance_sql(DISTANCE_STRATEGY)
+    if search.score_threshold is not None:
+        params["max_distance"] = distance_sql.max_distance(search.score_threshold)
+    if search.adaptive_k:
+        params["max_score_gap"] = search.max_score_gap
+        params["cumulative_score_target"] = search.cumulative_score_target
+    
+    query = text(_build_search_query(
+        embedding_table=store.EmbeddingStore.__tablename__,
+        collection_table=store.CollectionStore.__tablename__,
+        distance_strategy=DISTANCE_STRATEGY,
+        score_threshold=search.score_threshold,
+        adaptive_k=search.adaptive_k,
+    ))
+    with store.session_maker() as session:
+        rows = session.execute(query, params).all()
+    
+    return [
+        (
+            Document(id=row.id, page_content=row.document, metadata=row.cmetadata or {}),
+            float(row.distance),
+        )
+        for row in rows
+    ]
+
+
+def search_parent_documents(
+    question: str,
+    settings: Settings,
+    k: int = 10
+) -> List[Tuple[Document, float]]:
+    """
+    Busca chunks filhos similares e retorna suas janelas pai deduplicadas.
+    
+    Cada janela pai aparece uma única vez, com o melhor score entre os
+    seus filhos encontrados. Chunks sem `parent_id` (ingestões antigas)
+    são retornados como estão.
+    
+    Args:
+        question: Pergunta do usuário para buscar documentos similares
+        settings: Configurações da aplicação
+        k: Número máximo de chunks filhos a buscar (padrão: 10)
+        
+    Returns:
+        Lista de tuplas (Document, score) com as janelas pai mais similares
+    """
     store = get_vector_store(settings)
-    results = store.similarity_search_with_score(question, k=k)
+    children = search_documents(question, settings, k=k, store=store)
+    
+    # Agrupar filhos pela janela pai: os filhos já vêm ordenados por
+    # distância, então o primeiro filho de cada janela é o melhor
+    best: Dict[Union[str, int], Tuple[Document, float]] = {}
+    for index, (document, score) in enumerate(children):
+        key = document.metadata.get('parent_id') or index
+        best.setdefault(key, (document, score))
+    
+    parent_ids = [
+        document.metadata['parent_id']
+        for document, _ in best.values()
+        if document.metadata.get('parent_id')
+    ]
+    parents = get_parent_documents(parent_ids, settings, store.session_maker)
+    
+    results = []
+    for document, score in best.values():
+        parent = parents.get(document.metadata.get('parent_id'))
+        results.append((parent or document, score))
     
     return results
@@ -0,0 +1,86 @@
+"""Fixtures compartilhadas dos testes.
+
+Os testes que usam o banco rodam contra o pgvector do docker-compose
+(`docker compose up -d`) e são ignorados se ele não estiver acessível.
+"""
+
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+# Adicionar diretório raiz ao path para imports
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from src.config import DatabaseConfig, PDFConfig, SearchConfig, Settings, get_settings
+from src.services import vector_store
+
+VOCABULARY = ("alpha", "beta", "gamma")
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeddings determinísticos: quantas vezes cada palavra de VOCABULARY aparece."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        words = text.lower().split()
+        return [float(words.count(word)) for word in VOCABULARY]
+
+
+def with_search(settings: Settings, **search) -> Settings:
+    """Cópia de `settings` com a configuração de busca informada (sem ler o .env)."""
+    search = {"k": 10, "score_threshold": None, "adaptive_k": False, **search}
+    return settings.model_copy(update={"search": SearchConfig(**search)})
+
+
+@pytest.fixture(scope="session")
+def database_url() -> str:
+    url = get_settings().database.url
+    engine = create_engine(url)
+    try:
+        with engine.connect():
+            pass
+    except OperationalError:
+        pytest.skip("Banco pgvector do docker-compose não está acessível")
+    finally:
+        engine.dispose()
+    return url
+
+
+@pytest.fixture
+def settings(database_url, request, monkeypatch):
+    """Settings com coleção e tabela de janelas pai próprias do teste."""
+    monkeypatch.setattr(vector_store, "get_embeddings", lambda settings: KeywordEmbeddings())
+
+    name = f"test_{request.node.name}".lower()
+    settings = with_search(
+        Settings(
+            database=DatabaseConfig(
+                url=database_url,
+                collection_name=name,
+                parent_table_name=f"{name}_parent",
+            ),
+            pdf=PDFConfig(
+                chunk_size=120,
+                chunk_overlap=0,
+                child_chunk_size=50,
+                child_chunk_overlap=0,
+            ),
+        )
+    )
+
+    yield settings
+
+    vector_store.get_vector_store(settings).delete_collection()
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {settings.database.parent_table_name}"))
+    engine.dispose()
@@ -0,0 +1,126 @@
+"""Testes da ingestão small-to-big (janelas pai e chunks filhos)."""
+
+import pytest
+from langchain_core.documents import Document
+from langchain_postgres import PGVector
+from sqlalchemy import create_engine, text
+
+from src.config import PDFConfig, Settings
+from src.ingest import ingest_documents, split_documents
+from src.services.vector_store import get_vector_store, search_parent_documents
+
+
+def _page(word: str, page: int) -> Document:
+    content = " ".join(f"{word} termo{index}" for index in range(40))
+    return Document(page_content=content, metadata={"source": "teste.pdf", "page": page, "title": ""})
+
+
+def _stored_ids(settings):
+    """IDs das janelas pai e dos embeddings salvos na coleção do teste."""
+    store = get_vector_store(settings)
+    engine = create_engine(settings.database.url)
+    with engine.connect() as connection:
+        parent_ids = connection.execute(
+            text(
+                f"SELECT id FROM {settings.database.parent_table_name} "
+                "WHERE collection_name = :name"
+            ),
+            {"name": settings.database.collection_name},
+        ).scalars().all()
+        child_ids = connection.execute(
+            text(
+                f"SELECT e.id FROM {store.EmbeddingStore.__tablename__} e "
+                f"JOIN {store.CollectionStore.__tablename__} c ON e.collection_id = c.uuid "
+                "WHERE c.name = :name"
+            ),
+            {"name": settings.database.collection_name},
+        ).scalars().all()
+    engine.dispose()
+    return set(parent_ids), set(child_ids)
+
+
+def test_split_documents_links_children_to_parents():
+    settings = Settings(
+        pdf=PDFConfig(chunk_size=120, chunk_overlap=0, child_chunk_size=50, child_chunk_overlap=0)
+    )
+    docs = [_page("alpha", 0), _page("beta", 1)]
+
+    parents, parent_ids, children, ids = split_documents(docs, settings)
+    parents_by_id = dict(zip(parent_ids, parents))
+
+    assert len(parents) > 2
+    assert len(children) > len(parents)
+    assert len(set(ids)) == len(ids)
+    # Metadados vazios são removidos e os demais preservados nas janelas
+    assert all("title" not in parent.metadata for parent in parents)
+    assert {parent.metadata["page"] for parent in parents} == {0, 1}
+    for child_id, child in zip(ids, children):
+        parent = parents_by_id[child.metadata["parent_id"]]
+        assert child_id.startswith(child.metadata["parent_id"])
+        assert child.page_content in parent.page_content
+        assert child.metadata["page"] == parent.metadata["page"]
+    # IDs derivados do conteúdo: a mesma entrada gera os mesmos IDs
+    assert split_documents(docs, settings)[1] == parent_ids
+    assert split_documents(docs, settings)[3] == ids
+
+
+def test_reingest_removes_stale_parents_and_children(settings):
+    first = [_page("alpha", 0), _page("beta", 1)]
+    second = [_page("alpha", 0), _page("gamma", 1)]
+
+    ingest_documents(first, settings)
+    ingest_documents(second, settings)
+
+    _, parent_ids, _, ids = split_documents(second, settings)
+    assert _stored_ids(settings) == (set(parent_ids), set(ids))
+
+    # A página removida não aparece mais na busca
+    results = search_parent_documents("beta", settings, k=50)
+    assert all("beta" not in document.page_content for document, _ in results)
+
+
+def test_ingest_returns_parent_windows_on_search(settings):
+    docs = [_page("alpha", 0), _page("gamma", 1)]
+    parents, _, _, _ = split_documents(docs, settings)
+
+    ingest_documents(docs, settings)
+    results = search_parent_documents("gamma", settings, k=3)
+
+    assert results
+    assert all(document.page_content in {parent.page_content for parent in parents}
+               for document, _ in results)
+    assert "gamma" in results[0][0].page_content
+
+
+def test_failed_reingest_keeps_previous_index_searchable(settings, monkeypatch):
+    first = [_page("alpha", 0), _page("beta", 1)]
+    ingest_documents(first, settings)
+    stored = _stored_ids(settings)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("falha na API de embeddings")
+
+    monkeypatch.setattr(PGVector, "add_documents", fail)
+    with pytest.raises(RuntimeError):
+        ingest_documents([_page("gamma", 0)], settings)
+
+    # Os filhos antigos continuam apontando para as suas próprias janelas
+    _, old_children = stored
+    assert _stored_ids(settings)[1] == old_children
+    parents, _, _, _ = split_documents(first, settings)
+    results = search_parent_documents("beta", settings, k=3)
+    assert results
+    assert all(document.page_content in {parent.page_content for parent in parents}
+               for document, _ in results)
+
+
+def test_failed_first_ingest_leaves_search_working(settings, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("falha na API de embeddings")
+
+    monkeypatch.setattr(PGVector, "add_documents", fail)
+    with pytest.raises(RuntimeError):
+        ingest_documents([_page("alpha", 0)], settings)
+
+    # A tabela de janelas pai já existe: a busca não falha, só não encontra nada
+    assert search_parent_documents("alpha", settings, k=3) == []
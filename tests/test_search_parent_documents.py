@@ -0,0 +1,72 @@
+"""Testes da busca small-to-big: chunks filhos substituídos pelas janelas pai."""
+
+import pytest
+from langchain_core.documents import Document
+
+from src.services.parent_store import ensure_parent_table, save_parent_documents
+from src.services.vector_store import get_vector_store, search_parent_documents
+
+PARENTS = {"p1": "janela um", "p2": "janela dois"}
+
+# Distância de cosseno até "alpha" entre parênteses
+CHILDREN = [
+    ("c1", "alpha", "p1"),                  # 0.0
+    ("c2", "alpha alpha beta", "p1"),       # 0.106
+    ("c3", "alpha beta", "p2"),             # 0.293
+    ("c4", "alpha beta beta", None),        # 0.553
+    ("c5", "alpha beta beta beta", None),   # 0.684
+    ("c6", "beta gamma", "sem-janela"),     # 1.0
+]
+
+
+@pytest.fixture
+def indexed(settings):
+    store = get_vector_store(settings)
+    ensure_parent_table(settings, store.session_maker)
+    save_parent_documents(
+        documents=[Document(page_content=content) for content in PARENTS.values()],
+        ids=list(PARENTS),
+        settings=settings,
+        session_maker=store.session_maker,
+    )
+    store.add_documents(
+        documents=[
+            Document(
+                page_content=content,
+                metadata={"parent_id": parent_id} if parent_id else {},
+            )
+            for _, content, parent_id in CHILDREN
+        ],
+        ids=[child_id for child_id, _, _ in CHILDREN],
+    )
+    return settings
+
+
+def _contents(results):
+    return [document.page_content for document, _ in results]
+
+
+def test_children_are_deduplicated_onto_parents_in_relevance_order(indexed):
+    results = search_parent_documents("alpha", indexed, k=3)
+
+    # c1 e c2 pertencem a p1: a janela aparece uma vez, com o score do melhor filho
+    assert _contents(results) == ["janela um", "janela dois"]
+    assert [score for _, score in results] == pytest.approx([0.0, 0.293], abs=1e-3)
+
+
+def test_children_without_parent_id_return_their_own_text(indexed):
+    results = search_parent_documents("alpha", indexed, k=5)
+
+    # Filhos sem parent_id não são agrupados entre si
+    assert _contents(results) == [
+        "janela um",
+        "janela dois",
+        "alpha beta beta",
+        "alpha beta beta beta",
+    ]
+
+
+def test_missing_parent_row_falls_back_to_child_text(indexed):
+    results = search_parent_documents("gamma", indexed, k=1)
+
+    assert _contents(results) == ["beta gamma"]
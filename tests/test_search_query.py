@@ -0,0 +1,82 @@
+"""Testes da busca com threshold e adaptive-k aplicados no pgvector."""
+
+import math
+from typing import List
+
+import pytest
+from langchain_postgres.vectorstores import DistanceStrategy
+
+from src.services.vector_store import _get_distance_sql, get_vector_store, search_documents
+from tests.conftest import with_search
+
+# Distâncias de cosseno até a consulta "alpha" ([1, 0, 0]): salto de 0.30 entre c e d
+DISTANCES = {"a": 0.0, "b": 0.05, "c": 0.10, "d": 0.40, "e": 0.45}
+
+
+def _vector(distance: float) -> List[float]:
+    """Vetor unitário cuja distância de cosseno até [1, 0, 0] é `distance`."""
+    cosine = 1 - distance
+    return [cosine, math.sqrt(1 - cosine ** 2), 0.0]
+
+
+@pytest.fixture
+def store(settings):
+    store = get_vector_store(settings)
+    store.add_embeddings(
+        texts=list(DISTANCES),
+        embeddings=[_vector(distance) for distance in DISTANCES.values()],
+        metadatas=[{} for _ in DISTANCES],
+        ids=list(DISTANCES),
+    )
+    return store
+
+
+def _search(settings, store, question="alpha", k=10, **search) -> List[str]:
+    results = search_documents(question, with_search(settings, **search), k=k, store=store)
+    return [document.id for document, _ in results]
+
+
+def test_fixed_k_returns_nearest_rows_with_distances(settings, store):
+    results = search_documents("alpha", settings, k=10, store=store)
+
+    assert [document.id for document, _ in results] == ["a", "b", "c", "d", "e"]
+    assert [score for _, score in results] == pytest.approx(list(DISTANCES.values()), abs=1e-6)
+    assert _search(settings, store, k=2) == ["a", "b"]
+
+
+def test_score_threshold_is_applied_in_query(settings, store):
+    # Similaridade mínima 0.8 -> distância máxima 0.2
+    assert _search(settings, store, score_threshold=0.8) == ["a", "b", "c"]
+
+
+def test_adaptive_k_stops_at_score_gap(settings, store):
+    # O primeiro resultado (gap NULL) é mantido; o salto de 0.30 antes de "d" corta
+    assert _search(
+        settings, store, adaptive_k=True, max_score_gap=0.15, cumulative_score_target=10.0
+    ) == ["a", "b", "c"]
+
+
+def test_adaptive_k_stops_at_cumulative_target(settings, store):
+    # relevance_before: a=0.0, b=1.0, c=1.95 -> "c" já não entra com alvo 1.5
+    assert _search(
+        settings, store, adaptive_k=True, max_score_gap=0.15, cumulative_score_target=1.5
+    ) == ["a", "b"]
+
+
+def test_adaptive_k_with_large_gap_limit_keeps_all_rows(settings, store):
+    assert _search(
+        settings, store, adaptive_k=True, max_score_gap=0.5, cumulative_score_target=10.0
+    ) == ["a", "b", "c", "d", "e"]
+
+
+def test_threshold_removing_every_row_returns_nothing(settings, store):
+    # "gamma" é ortogonal a todos os vetores: distância 1, acima do máximo de 0.5
+    assert _search(settings, store, question="gamma", score_threshold=0.5) == []
+    assert _search(
+        settings, store, question="gamma", score_threshold=0.5, adaptive_k=True
+    ) == []
+
+
+def test_unsupported_distance_strategy_raises():
+    with pytest.raises(ValueError):
+        _get_distance_sql(DistanceStrategy.MAX_INNER_PRODUCT)